@@ -1,14 +1,20 @@
 import ast
+import hashlib
+import json
+import os
+import sqlite3
 
-from collections import namedtuple
-from functools import partial
+import importlib.metadata as importlib_metadata
 
-import attr
 
-import importlib.metadata as importlib_metadata
+# AST fields that cannot contain nodes any check is interested in;
+# annotations are not listed because they hold arbitrary expressions
+_SKIP_FIELDS = frozenset(("ctx", "type_comment"))
+
+# sentinel for absent AST fields, cheaper than iter_fields' try/except
+_MISSING = object()
 
 
-@attr.s
 class Visitor(ast.NodeVisitor):
     """
     ast.NodeVisitor calls the appropriate method for a given node type
@@ -19,62 +25,102 @@ class Visitor(ast.NodeVisitor):
     would produce a 'fail' condition.
     """
 
-    errors = attr.ib(default=attr.Factory(list))
+    def __init__(self):
+        self.errors = []
 
-    def visit_Call(self, node):
+    def visit_Call(self, node: ast.Call) -> None:
         """
         Called for `df.method(inplace=True)` nodes.
         """
         self.generic_visit(node)  # continue checking children
-        self.errors.extend(check_inplace_false(node))
+        check_inplace_false(node, self.errors)
 
-    def visit_Assign(self, node):
+    def visit_Assign(self, node: ast.Assign) -> None:
         """
-        Called for `df=df.method()` nodes.
-        Called for `df=df[col]` nodes.
-        Called for `df[col]=...` nodes.
-        Called for `df.col=...` nodes.
+        Called for `df=df.method()` nodes (PMC002).
+        Called for `df=df[col]` nodes (PMC003).
+        Called for `df[col]=...` nodes (PMC004).
+        Called for `df.col=...` nodes (PMC005).
+        Called for `df.index=...` nodes (PMC006).
+
+        The five Assign checks run as a single pass: the targets are
+        iterated exactly once and the value is walked at most once, with
+        the emitters looked up in precomputed dispatch tables keyed on
+        the node type instead of an isinstance ladder.
         """
         self.generic_visit(node)  # continue checking children
-        self.errors.extend(check_reassignment_with_call(node))
-        self.errors.extend(check_reassignment_with_subscript(node))
-        self.errors.extend(check_assignment_with_subscript(node))
-        self.errors.extend(check_assignment_with_attribute(node))
-        self.errors.extend(check_assignment_of_index(node))
-
-    def visit_Subscript(self, node):
+        errors = self.errors
+        target_dispatch = _ASSIGN_TARGET_DISPATCH
+        _Name = ast.Name
+        targets = set()
+        for target in node.targets:
+            if type(target) is _Name:
+                targets.add(target.id)
+            else:
+                fn = target_dispatch.get(type(target))
+                if fn is not None:
+                    fn(target, node, errors)
+        if not targets:  # no Name target, so neither PMC002 nor PMC003 can fire
+            return
+        fn = _ASSIGN_VALUE_DISPATCH.get(type(node.value))
+        if fn is not None:
+            fn(node, targets, errors)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
         """
         Called for `df.loc[df.col==0]` nodes.
         """
         self.generic_visit(node)  # continue checking children
-        self.errors.extend(check_selection_without_lambda(node))
+        check_selection_without_lambda(node, self.errors)
 
-    def check(self, node):
+    def visit(self, node: ast.AST) -> None:
+        """
+        Dispatches a node to the relevant `visit_` method.
+
+        ast.NodeVisitor.visit rebuilds the method name and calls getattr
+        on every node; a direct lookup on the node type avoids that
+        per-node overhead.
+        """
+        fn = self._DISPATCH.get(type(node))
+        return fn(self, node) if fn is not None else self.generic_visit(node)
+
+    _DISPATCH = {ast.Call: visit_Call, ast.Assign: visit_Assign, ast.Subscript: visit_Subscript}
+
+    def check(self, node: ast.AST) -> list:
         self.errors = []
         self.visit(node)
         return self.errors
 
-    def generic_visit(self, node):
+    def generic_visit(self, node: ast.AST) -> None:
         """Called if no explicit visitor function exists for a node.
 
-        This also attaches breadcrumbs before visiting a node so we can
-        later look up the syntax tree. This way, there's more
-        information to decide whether or not to raise.
-
-        The breadcrumb name is `__pandas_method_chaining_parent` (name mangled) to
-        avoid all reasonable name collisions.
-
-        .. see also:: `check_for_values`.
+        Lean replacement for ast.NodeVisitor.generic_visit: fields that
+        cannot contain children of interest (expression contexts, type
+        comments) are skipped outright, which avoids visiting the
+        Load/Store/Del node attached to every Name, and _fields is
+        iterated directly rather than through the ast.iter_fields
+        generator.
         """
-        for field, value in ast.iter_fields(node):
-            if isinstance(value, list):
+        # locals for names read once per field: LOAD_FAST instead of LOAD_GLOBAL
+        visit = self.visit
+        skip = _SKIP_FIELDS
+        missing = _MISSING
+        _isinstance = isinstance
+        _list = list
+        _AST = ast.AST
+        _getattr = getattr
+        for field in node._fields:
+            if field in skip:
+                continue
+            value = _getattr(node, field, missing)
+            if value is missing:
+                continue
+            if _isinstance(value, _list):
                 for item in value:
-                    if isinstance(item, ast.AST):
-                        item.__pandas_method_chaining_parent = node
-                        self.visit(item)
-            elif isinstance(value, ast.AST):
-                value.__pandas_method_chaining_parent = node
-                self.visit(value)
+                    if _isinstance(item, _AST):
+                        visit(item)
+            elif _isinstance(value, _AST):
+                visit(value)
 
 
 class PandasMethodChainingException(Exception):
@@ -85,12 +131,28 @@ class Plugin:
     name = __name__
     version = importlib_metadata.version(__name__)
 
-    def __init__(self, tree):
+    def __init__(self, tree, filename=None, lines=None):
         self._tree = tree
+        self._filename = filename
+        self._lines = lines
 
     def run(self):
         try:
-            return Visitor().check(self._tree)
+            # hash the source flake8 actually checked: with
+            # `flake8 - --stdin-display-name=<path>` the tree comes from
+            # the stdin buffer, not from the file at `filename`, so the
+            # on-disk bytes must never feed the cache key
+            digest = None
+            if self._filename and self._lines is not None and _cache_enabled():
+                src = "".join(self._lines).encode("utf-8")
+                digest = hashlib.sha256(src).hexdigest()
+                cached = _cache_get(self._filename, digest)
+                if cached is not None:
+                    return cached
+            errors = Visitor().check(self._tree)
+            if digest is not None:
+                _cache_put(self._filename, digest, errors)
+            return errors
         except Exception as e:
             raise PandasMethodChainingException(e)
 
@@ -111,171 +173,154 @@ class Plugin:
             optmanager.remove_from_default_ignore(disabled_by_default)
 
 
-def check_inplace_false(node):
-    """Check AST for function calls using inplace=True keyword argument.
-
-    Disapproved:
-        df.method(inplace=True)
-
-    Approved:
-        df.method(inplace=False)
+def check_source(src: str) -> list:
+    """Check a Python source string directly, without going through flake8.
 
-    Error/warning message to recommend avoidance of inplace=True due to inconsistent behavior.
+    Convenience entry point for batch runs, e.g. mapping many files over
+    a ProcessPoolExecutor from a pre-commit hook.
 
-    :param node: an AST node of type Call
-    :return errors: list of errors of type PMC001 with line number and column offset
+    :param src: Python source code
+    :return: list of errors with line number and column offset
     """
-    errors = []
-    for kw in node.keywords:
-        if kw.arg == "inplace" and kw.value.value is True:
-            errors.append(PMC001(node.lineno, node.col_offset))
-    return errors
-
-
-def check_reassignment_with_call(node):
-    """Check AST for reassignment with call.
-
-    Disapproved:
-        df = df.method()
-        df = pd.get_dummies(df, cols)
-        df = df.method1().method2()
-        ...
-
-    Approved:
-        df.method()
-        pd.get_dummies(df, cols)
-        df.method1().method2()
-        ...
+    return Visitor().check(ast.parse(src))
 
-    Error/warning message to replace reassignment using call by method chaining.
 
-    :param node: an AST node of type Call
-    :return errors: list of errors of type PMC002 with line number and column offset
-    """
+# on-disk cache of per-file results, keyed by (filename, SHA-256 of the
+# source, plugin version) so unchanged files skip the AST walk entirely;
+# opt-in via the PMC_CACHE environment variable
+_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "pandas-method-chaining", "cache.sqlite"
+)
 
-    errors = []
+_cache_con = None
 
-    if isinstance(node.value, ast.Call):
-        targets = {target.id for target in node.targets if hasattr(target, "id")}
-        names = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
-        if targets.intersection(names):
-            errors.append(PMC002(node.lineno, node.col_offset))
 
-    return errors
+def _cache_enabled() -> bool:
+    """The result cache is opt-in: set PMC_CACHE=1 to activate it."""
+    return os.environ.get("PMC_CACHE") == "1"
 
 
-def check_reassignment_with_subscript(node):
-    """Check AST for reassignment with subscript.
+def _cache_connection():
+    """Open the result cache once per process, creating the database and table if needed."""
+    global _cache_con
+    if _cache_con is None:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        con = sqlite3.connect(_CACHE_PATH)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(filename TEXT, digest TEXT, version TEXT, errors TEXT, "
+            "PRIMARY KEY (filename, digest, version))"
+        )
+        _cache_con = con
+    return _cache_con
+
+
+def _cache_get(filename, digest):
+    """Return the cached error list for (filename, digest), or None on a miss."""
+    try:
+        row = _cache_connection().execute(
+            "SELECT errors FROM results WHERE filename=? AND digest=? AND version=?",
+            (filename, digest, Plugin.version),
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None:
+        return None
+    return [Error(lineno, col, message) for lineno, col, message in json.loads(row[0])]
+
+
+def _cache_put(filename, digest, errors):
+    """Store the error list for (filename, digest); failures are ignored."""
+    payload = json.dumps([[e.lineno, e.col, e.message] for e in errors])
+    try:
+        con = _cache_connection()
+        con.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (filename, digest, Plugin.version, payload),
+        )
+        con.commit()
+    except (sqlite3.Error, OSError):
+        pass
 
-    Disapproved:
-        df = df[]
-        df = df.loc[]
-        df = df.method()[]
-        df = df.method().loc[]
-        df = df.method1().method2()[]
-        ...
 
-    Approved:
-        df[]
-        df.loc[]
-        df.method()[]
-        df.method().loc[]
-        df.method1().method2()[]
-        ...
+def _name_ids_hit(root: ast.AST, targets: set) -> bool:
+    """Check whether a Name node whose id is in `targets` occurs under `root`.
 
-    Error/warning message to replace reassignment using subscript by method chaining.
+    Iterative replacement for building the full `{Name.id}` set with
+    `ast.walk`: the traversal short-circuits on the first hit and never
+    materializes the intermediate set.
 
-    :param node: an AST node of type Call
-    :return errors: list of errors of type PMC003 with line number and column offset
+    :param root: an AST node to traverse
+    :param targets: a set of variable names to look for
+    :return: True as soon as a matching Name is found, False otherwise
     """
+    # locals for names read once per node: LOAD_FAST instead of LOAD_GLOBAL
+    _isinstance = isinstance
+    _Name = ast.Name
+    _iter_child_nodes = ast.iter_child_nodes
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if _isinstance(n, _Name):
+            if n.id in targets:
+                return True
+        else:
+            stack.extend(_iter_child_nodes(n))
+    return False
 
-    errors = []
 
-    if isinstance(node.value, ast.Subscript):
-        targets = {target.id for target in node.targets if hasattr(target, "id")}
-        names = {n.id for n in ast.walk(node.value.value) if isinstance(n, ast.Name)}
-        if targets.intersection(names):
-            errors.append(PMC003(node.lineno, node.col_offset))
+def _emit_pmc004(target: ast.Subscript, node: ast.Assign, errors: list) -> None:
+    """Emit PMC004 for a subscript target, e.g. `df[col] = 0`."""
+    errors.append(PMC004(node.lineno, node.col_offset))
 
-    return errors
 
+def _emit_pmc005_or_006(target: ast.Attribute, node: ast.Assign, errors: list) -> None:
+    """Emit PMC006 for `df.index`/`df.columns` targets, PMC005 otherwise."""
+    if target.attr in ("index", "columns"):
+        errors.append(PMC006(node.lineno, node.col_offset))
+    else:
+        errors.append(PMC005(node.lineno, node.col_offset))
 
-def check_assignment_with_subscript(node):
-    """Check AST for assignment with subscript.
 
-    Disapproved:
-        df[col] = 0
-        df.loc[col] = 0
-        ...
+def _emit_pmc002(node: ast.Assign, targets: set, errors: list) -> None:
+    """Emit PMC002 when a call value reuses one of the assigned names."""
+    if _name_ids_hit(node.value, targets):
+        errors.append(PMC002(node.lineno, node.col_offset))
 
-    Approved:
-        df.assign(col=0)
-        ...
 
-    Error/warning message to replace assignment using subscript by method chaining.
+def _emit_pmc003(node: ast.Assign, targets: set, errors: list) -> None:
+    """Emit PMC003 when a subscript value reuses one of the assigned names."""
+    if _name_ids_hit(node.value.value, targets):
+        errors.append(PMC003(node.lineno, node.col_offset))
 
-    :param node: an AST node of type Call
-    :return errors: list of errors of type PMC004 with line number and column offset
-    """
 
-    errors = []
-    for target in node.targets:
-        if isinstance(target, ast.Subscript):
-            errors.append(PMC004(node.lineno, node.col_offset))
-    return errors
+# decision tables for the fused Assign check: O(1) lookup on the node type
+_ASSIGN_TARGET_DISPATCH = {ast.Subscript: _emit_pmc004, ast.Attribute: _emit_pmc005_or_006}
+_ASSIGN_VALUE_DISPATCH = {ast.Call: _emit_pmc002, ast.Subscript: _emit_pmc003}
 
 
-def check_assignment_with_attribute(node):
-    """Check AST for assignment with attribute.
-
-    Disapproved:
-        df.col = 0
-        ...
-
-    Approved:
-        df.assign(col=0)
-        ...
-
-    Error/warning message to replace assignment using attribute by method chaining.
-
-    :param node: an AST node of type Call
-    :return errors: list of errors of type PMC005 with line number and column offset
-    """
-
-    errors = []
-    for target in node.targets:
-        if isinstance(target, ast.Attribute) and target.attr not in ["index", "columns"]:
-            errors.append(PMC005(node.lineno, node.col_offset))
-    return errors
-
-
-def check_assignment_of_index(node):
-    """Check AST for assignment of index.
+def check_inplace_false(node: ast.Call, errors: list) -> None:
+    """Check AST for function calls using inplace=True keyword argument.
 
     Disapproved:
-        df.index = ['idx1', 'idx2']
-        df.columns = ['col1', 'col2']
-        ...
+        df.method(inplace=True)
 
     Approved:
-        df.rename({1:'idx1', 2:'idx2'})
-        df.rename({1:'col1', 2:'col2'}, axis=1)
-        ...
+        df.method(inplace=False)
 
-    Error/warning message to replace assignment using attribute by method chaining.
+    Error/warning message to recommend avoidance of inplace=True due to inconsistent behavior.
 
     :param node: an AST node of type Call
-    :return errors: list of errors of type PMC006 with line number and column offset
+    :param errors: list collecting errors of type PMC001 with line number and column offset
     """
-
-    errors = []
-    for target in node.targets:
-        if isinstance(target, ast.Attribute) and target.attr in ["index", "columns"]:
-            errors.append(PMC006(node.lineno, node.col_offset))
-    return errors
+    for kw in node.keywords:
+        if kw.arg == "inplace" and isinstance(kw.value, ast.Constant) and kw.value.value is True:
+            errors.append(PMC001(node.lineno, node.col_offset))
+            return
 
 
-def check_selection_without_lambda(node):
+def check_selection_without_lambda(node: ast.Subscript, errors: list) -> None:
     """Check AST for selection without lambda.
 
     Disapproved:
@@ -289,53 +334,57 @@ def check_selection_without_lambda(node):
     Error/warning message to use selections with lambda.
 
     :param node: an AST node of type Subscript
-    :return errors: list of errors of type PMC007 with line number and column offset
+    :param errors: list collecting errors of type PMC007 with line number and column offset
     """
 
-    errors = []
     # case df[df.isna().any(axis=1)]
     if isinstance(node.value, ast.Name):
-        names = {n.id for n in ast.walk(node.slice) if isinstance(n, ast.Name)}
-        if node.value.id in names:
+        if _name_ids_hit(node.slice, {node.value.id}):
             errors.append(PMC007(node.lineno, node.col_offset))
     # case df.loc[df.isna().any(axis=1)]
     elif isinstance(node.value, ast.Attribute) and isinstance(node.value.value, ast.Name):
-        names = {n.id for n in ast.walk(node.slice) if isinstance(n, ast.Name)}
-        if node.value.value.id in names:
+        if _name_ids_hit(node.slice, {node.value.value.id}):
             errors.append(PMC007(node.lineno, node.col_offset))
-    return errors
 
 
-error = namedtuple("Error", ["lineno", "col", "message", "type"])
-MethodChainingError = partial(partial, error, type=Plugin)
+class Error:
+    """A reported error, unpackable as (lineno, col, message, type) for flake8."""
 
-PMC001 = MethodChainingError(
-    message="PMC001 usage of 'inplace=True' should be avoided"
-)
+    __slots__ = ("lineno", "col", "message", "type")
 
-PMC002 = MethodChainingError(
-    message="PMC002 reassignment using call could be replaced by method chaining"
-)
+    def __init__(self, lineno, col, message):
+        self.lineno = lineno
+        self.col = col
+        self.message = message
+        self.type = Plugin
 
-PMC003 = MethodChainingError(
-    message="PMC003 reassignment using subscript could be replaced by method chaining"
-)
+    def __iter__(self):
+        yield self.lineno
+        yield self.col
+        yield self.message
+        yield self.type
 
-PMC004 = MethodChainingError(
-    message="PMC004 assignment using subscript could be replaced by 'assign()'"
-)
 
-PMC005 = MethodChainingError(
-    message="PMC005 assignment using attribute could be replaced by 'assign()'"
-)
+def MethodChainingError(message):
+    """Build a PMC00x error constructor with `message` bound."""
+    def make(lineno, col):
+        return Error(lineno, col, message)
+    return make
 
-PMC006 = MethodChainingError(
-    message="PMC006 assignment of index or columns could be replaced by 'rename()'"
-)
 
-PMC007 = MethodChainingError(
-    message="PMC007 selection reusing a variable could be performed with a lambda"
-)
+PMC001 = MethodChainingError("PMC001 usage of 'inplace=True' should be avoided")
+
+PMC002 = MethodChainingError("PMC002 reassignment using call could be replaced by method chaining")
+
+PMC003 = MethodChainingError("PMC003 reassignment using subscript could be replaced by method chaining")
+
+PMC004 = MethodChainingError("PMC004 assignment using subscript could be replaced by 'assign()'")
+
+PMC005 = MethodChainingError("PMC005 assignment using attribute could be replaced by 'assign()'")
+
+PMC006 = MethodChainingError("PMC006 assignment of index or columns could be replaced by 'rename()'")
+
+PMC007 = MethodChainingError("PMC007 selection reusing a variable could be performed with a lambda")
 
 # disable PMCXXX MethodChainingError by default
-disabled_by_default = [key for key, value in globals().items() if key.startswith("PMC") and isinstance(value, partial)]
+disabled_by_default = ("PMC001", "PMC002", "PMC003", "PMC004", "PMC005", "PMC006", "PMC007")
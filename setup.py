@@ -1,6 +1,6 @@
 from setuptools import setup
 
-requires = ["flake8 > 3.0.0", "attr"]
+requires = ["flake8 > 3.0.0"]
 
 flake8_entry_point = "flake8.extension"
 
@@ -19,6 +19,16 @@ def test_PMC_001_pass():
     assert actual == expected
 
 
+def test_PMC_001_pass_non_literal():
+    """
+    Test that using df.set_index('col', inplace=flag) does not result in an error.
+    """
+    statement = "df.set_index('col', inplace=flag)"
+    actual = _results(statement)
+    expected = set()
+    assert actual == expected
+
+
 def test_PMC_001_fail():
     """
     Test that using df.set_index('col', inplace=True) results in an error.
@@ -28,3 +38,13 @@ def test_PMC_001_fail():
     expected = {f"{i+1}:0 PMC001 usage of 'inplace=True' should be avoided"
                 for i in range(statement.count("\n")+1)}
     assert actual == expected
+
+
+def test_PMC_001_fail_annotation():
+    """
+    Test that using df.set_index('col', inplace=True) inside an annotation results in an error.
+    """
+    statement = "def g(a: df.set_index('col', inplace=True)): pass"
+    actual = _results(statement)
+    expected = {"1:9 PMC001 usage of 'inplace=True' should be avoided"}
+    assert actual == expected
@@ -0,0 +1,71 @@
+import ast
+
+import pytest
+
+import pandas_method_chaining
+from pandas_method_chaining import Plugin
+
+
+STATEMENT = "df.set_index('col', inplace=True)\n"
+EXPECTED = {"1:0 PMC001 usage of 'inplace=True' should be avoided"}
+
+
+def _results(statement=STATEMENT, filename="checked.py"):
+    tree = ast.parse(statement)
+    plugin = Plugin(tree, filename, statement.splitlines(keepends=True))
+    return {f"{line}:{col} {msg}" for line, col, msg, _ in plugin.run()}
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    """Enable the cache, point it at a temporary file and close it afterwards."""
+    path = tmp_path / "cache.sqlite"
+    monkeypatch.setenv("PMC_CACHE", "1")
+    monkeypatch.setattr(pandas_method_chaining, "_CACHE_PATH", str(path))
+    monkeypatch.setattr(pandas_method_chaining, "_cache_con", None)
+    yield path
+    if pandas_method_chaining._cache_con is not None:
+        pandas_method_chaining._cache_con.close()
+        pandas_method_chaining._cache_con = None
+
+
+def test_cache_disabled_by_default(tmp_path, monkeypatch):
+    """
+    Test that without PMC_CACHE=1 no cache file is created.
+    """
+    path = tmp_path / "cache.sqlite"
+    monkeypatch.delenv("PMC_CACHE", raising=False)
+    monkeypatch.setattr(pandas_method_chaining, "_CACHE_PATH", str(path))
+    monkeypatch.setattr(pandas_method_chaining, "_cache_con", None)
+    assert _results() == EXPECTED
+    assert not path.exists()
+
+
+def test_cache_miss_then_hit(cache_path):
+    """
+    Test that the first run stores its errors and the second run reads them back.
+    """
+    assert _results() == EXPECTED
+    con = pandas_method_chaining._cache_connection()
+    con.execute("UPDATE results SET errors='[[1, 0, \"sentinel\"]]'")
+    con.commit()
+    assert _results() == {"1:0 sentinel"}
+
+
+def test_cache_version_invalidation(cache_path):
+    """
+    Test that entries stored under another plugin version are not served.
+    """
+    assert _results() == EXPECTED
+    con = pandas_method_chaining._cache_connection()
+    con.execute("UPDATE results SET version='0.0.0', errors='[[1, 0, \"sentinel\"]]'")
+    con.commit()
+    assert _results() == EXPECTED
+
+
+def test_cache_corrupt_db(cache_path):
+    """
+    Test that a corrupt cache file is ignored and the checks still run.
+    """
+    cache_path.write_bytes(b"not a database")
+    assert _results() == EXPECTED